@@ -1,8 +1,24 @@
 #%%
+import heapq
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
 import streamlit as st
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
+from streamlit.logger import get_logger
+
+# Streamlitのログ設定（logger.level、既定はinfo）に従ってサーバーログへ出力
+logger = get_logger(__name__)
 
 # ページ設定
 st.set_page_config(
@@ -401,6 +417,329 @@ def create_gradient_cmap():
     colors = ["#FF6B6B", "#FFE66D", "#4ECDC4"]
     return LinearSegmentedColormap.from_list("bias_gradient", colors)
 
+# 日本語フォント対応
+plt.rcParams['font.family'] = ['DejaVu Sans', 'Hiragino Sans', 'Yu Gothic', 'Meiryo', 'Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic', 'Noto Sans CJK JP']
+
+# 総合評価の段階定義（正解率の下限, 表示種別, 見出し, 特徴）
+RESULT_TIERS = [
+    (0.8, "success", "**🎖️ 優秀！ 深層心理バイアスに囚われない合理的思考ができています**", """
+            - ✅ 感情より事実を重視する判断力
+            - ✅ マーケティング手法を見抜く洞察力  
+            - ✅ 統計的・論理的思考力
+            - ✅ 長期的視点での意思決定能力
+            """),
+    (0.6, "info", "**🧠 良好！ バイアスを意識しつつも、時々影響を受けています**", """
+            - ⚠️ 特定の状況で感情的判断をしがち
+            - ⚠️ 『お得』という表現に弱い傾向
+            - ⚠️ 周囲の意見に影響されることがある
+            - ✅ 基本的な論理的思考は身についている
+            """),
+    (0.4, "warning", "**⚠️ 要注意！ 複数のバイアスの影響を受けています**", """
+            - ❌ 広告文句や営業トークに弱い
+            - ❌ 過去の選択に固執しがち  
+            - ❌ 数字の表現方法に大きく影響される
+            - ❌ 短期的な利益を過大評価する傾向
+            """),
+    (0.0, "error", "**🚨 改善必要！ 強い心理的バイアスの影響下にあります**", """
+            - 🔴 感情的な判断が論理的判断を上回っている
+            - 🔴 『みんながやっている』という同調圧力に弱い
+            - 🔴 数字よりも物語やイメージに強く影響される
+            - 🔴 長期的視点よりも目先の利益を重視
+            """),
+]
+
+# 日常での実践方法
+PRACTICE_TIPS = {
+    "損失回避": ["投資前に最大損失額を決める", "月1回ポートフォリオを見直す", "損失を『授業料』として記録する"],
+    "サンクコスト": ["意思決定時に『これまでのコスト』を考慮しない練習", "定期的なサブスクリプション見直し日を設定", "『やめる勇気』を評価する"],
+    "アンカリング": ["複数の情報源から価格を調べる習慣", "最初の価格を無視する練習", "相場観を養うため定期的に市場調査"],
+    "現在バイアス": ["未来の自分への手紙を書く", "長期目標を毎日見る場所に掲示", "衝動的な決断は24時間待つルール"],
+    "社会的証明": ["自分だけの判断基準リストを作る", "『みんな』の具体的な人数を確認する癖", "少数派の意見を意識的に探す"],
+    "確証バイアス": ["自分の意見に反対する記事を必ず1つ読む", "友人に『反対意見』を求める", "決断前に反対理由を3つ挙げる"],
+    "フレーミング効果": ["数値は必ず絶対値で確認", "複数の表現で同じ情報を見る", "％と実数の両方で確認する習慣"],
+    "希少性の原理": ["『限定』『残りわずか』を見たら一度立ち止まる", "人工的希少性を見抜く練習", "本当の需要と供給を調べる"],
+    "返報性の原理": ["贈り物の意図を考える習慣", "すぐにお返しせず時間を置く", "心理的な負債を作らないよう意識"],
+    "同調圧力": ["『みんな』の正体を具体的に確認", "匿名で自分の意見を整理する時間を作る", "少数派でいることに慣れる"],
+    "楽観バイアス": ["統計データと自分の予測を比較記録", "最悪シナリオを必ず想定", "第三者の意見を積極的に求める"],
+    "後知恵バイアス": ["予測を事前に記録する習慣", "結果を知る前の自分の考えを思い出す", "不確実性を受け入れる練習"],
+    "代表性ヒューリスティック": ["統計的基準率を調べる癖", "固定観念リストを作り定期見直し", "個別事例の特殊性を意識"],
+    "可用性ヒューリスティック": ["印象的な事例と統計データを区別", "メディアの偏りを意識する", "身近な体験と全体傾向を分けて考える"],
+    "プロスペクト理論": ["期待値計算を習慣化", "確実性と不確実性のリスクを比較", "確率的思考の訓練"]
+}
+
+# 復習用の問題バンク（全カテゴリの問題を通し番号で管理し、バイアスから引けるよう索引化）
+QUESTION_BANK = [q for questions in categories.values() for q in questions]
+BIAS_INDEX = {}
+for qid, q in enumerate(QUESTION_BANK):
+    BIAS_INDEX.setdefault(q['bias'], []).append(qid)
+
+# 復習間隔（秒）：正解するごとに次の段階へ進み、間違えると最初に戻る
+REVIEW_INTERVALS = [60, 10 * 60, 24 * 60 * 60, 3 * 24 * 60 * 60, 7 * 24 * 60 * 60]
+
+# 復習スケジュールの保存先（環境変数で変更可。URLの uid ごとに [出題時刻, 問題番号, 段階] を1行ずつ追記）
+REVIEW_STATE_DIR = os.environ.get(
+    "BIAS_REVIEW_STATE_DIR", os.path.join(tempfile.gettempdir(), "bias_review_state")
+)
+REVIEW_UID_PATTERN = re.compile(r"[0-9a-f]{32}")
+REVIEW_STATE_FILE_PATTERN = re.compile(r"[0-9a-f]{32}\.jsonl|review-.*\.tmp")
+
+# 最終更新からこの期間を過ぎた保存ファイルは削除（最長の復習間隔より十分長くとる）
+REVIEW_STATE_TTL = 30 * 24 * 60 * 60
+REVIEW_PRUNE_INTERVAL = 60 * 60
+
+def review_state_path(uid):
+    return os.path.join(REVIEW_STATE_DIR, f"{uid}.jsonl")
+
+# 保存ファイルの1行を検証して (出題時刻, 問題番号, 段階) を返す（不正な行はNone）
+def parse_review_entry(line):
+    try:
+        due, qid, stage = json.loads(line)
+    except (ValueError, TypeError):
+        return None
+    if not (isinstance(due, int) and isinstance(qid, int) and isinstance(stage, int)):
+        return None
+    if not (0 <= qid < len(QUESTION_BANK) and stage >= 0):
+        return None
+    return due, qid, min(stage, len(REVIEW_INTERVALS) - 1)
+
+# ユーザーごとの復習スケジュール（heap: (出題時刻, 問題番号) の優先度付きキュー, stage: 問題番号→段階）
+def get_review_schedule():
+    if "review_schedule" not in st.session_state:
+        latest = {}
+        line_count = 0
+        uid = st.query_params.get("uid", "")
+        if REVIEW_UID_PATTERN.fullmatch(uid):
+            try:
+                with open(review_state_path(uid), encoding="utf-8") as f:
+                    for line in f:
+                        line_count += 1
+                        entry = parse_review_entry(line)
+                        if entry is not None:
+                            latest[entry[1]] = entry
+            except OSError:
+                latest = {}
+        
+        schedule = {
+            "heap": [(due, qid) for due, qid, _ in latest.values()],
+            "stage": {qid: stage for _, qid, stage in latest.values()},
+        }
+        heapq.heapify(schedule["heap"])
+        
+        # 追記で膨らんだログは読み込み時に最新状態だけへ圧縮
+        if line_count > 2 * len(latest) + 16:
+            compact_review_state(uid, schedule)
+        st.session_state.review_schedule = schedule
+    return st.session_state.review_schedule
+
+# 現在のスケジュールだけを書き出して保存ファイルを置き換え
+def compact_review_state(uid, schedule):
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=REVIEW_STATE_DIR, prefix="review-", suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            for due, qid in schedule["heap"]:
+                f.write(json.dumps([due, qid, schedule["stage"][qid]]) + "\n")
+        os.replace(tmp_path, review_state_path(uid))
+    except OSError:
+        logger.warning("復習スケジュールを圧縮できませんでした: %s", uid, exc_info=True)
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+# 変更のあった (出題時刻, 問題番号, 段階) だけを追記保存（初回保存時にURLへ uid を付与）
+def save_review_entries(entries):
+    uid = st.query_params.get("uid", "")
+    if not REVIEW_UID_PATTERN.fullmatch(uid):
+        uid = uuid.uuid4().hex
+        st.query_params["uid"] = uid
+    path = review_state_path(uid)
+    try:
+        os.makedirs(REVIEW_STATE_DIR, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(list(entry)) + "\n" for entry in entries))
+    except OSError:
+        logger.warning("復習スケジュールを保存できませんでした: %s", path, exc_info=True)
+    prune_review_states()
+
+# 保存ファイル掃除の実行時刻（プロセス全体で共有）
+@st.cache_resource
+def get_review_prune_state():
+    return {"lock": threading.Lock(), "last": 0.0}
+
+# 長期間更新のない保存ファイルを削除（1時間に1回まで）
+def prune_review_states():
+    state = get_review_prune_state()
+    now = time.time()
+    with state["lock"]:
+        if now - state["last"] < REVIEW_PRUNE_INTERVAL:
+            return
+        state["last"] = now
+    try:
+        names = os.listdir(REVIEW_STATE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not REVIEW_STATE_FILE_PATTERN.fullmatch(name):
+            continue
+        path = os.path.join(REVIEW_STATE_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > REVIEW_STATE_TTL:
+                os.remove(path)
+        except OSError:
+            pass
+
+# 検出バイアスに紐づく問題を即時出題としてスケジュールに追加（追加した (出題時刻, 問題番号, 段階) を返す）
+def schedule_biases(schedule, biases, now):
+    added = []
+    for bias in biases:
+        for qid in BIAS_INDEX.get(bias, []):
+            if qid not in schedule["stage"]:
+                schedule["stage"][qid] = 0
+                heapq.heappush(schedule["heap"], (now, qid))
+                added.append((now, qid, 0))
+    return added
+
+# 出題時刻を過ぎた先頭の問題番号を返す（無ければNone）
+def next_due_review(schedule, now):
+    heap = schedule["heap"]
+    if heap and heap[0][0] <= now:
+        return heap[0][1]
+    return None
+
+# 回答結果に応じて段階を更新し、次回の出題時刻で再登録
+def record_review(schedule, qid, correct, now):
+    heap = schedule["heap"]
+    if not heap or heap[0][1] != qid:
+        return None
+    stage = min(schedule["stage"][qid] + 1, len(REVIEW_INTERVALS) - 1) if correct else 0
+    schedule["stage"][qid] = stage
+    heapq.heapreplace(heap, (now + REVIEW_INTERVALS[stage], qid))
+    return REVIEW_INTERVALS[stage]
+
+# 秒数を「〇秒」「〇分」「〇日」形式に変換
+def format_interval(seconds):
+    if seconds >= 24 * 60 * 60:
+        return f"{seconds // (24 * 60 * 60)}日"
+    if seconds >= 60 * 60:
+        return f"{seconds // (60 * 60)}時間"
+    if seconds >= 60:
+        return f"{seconds // 60}分"
+    return f"{max(1, seconds)}秒"
+
+# 診断結果の事前計算用ワーカー（全セッションで共有）
+# グラフ描画はCPU処理のためコア数（最大4）を上限とし、古くなった計算は回答変更時に破棄する
+PRECOMPUTE_WORKERS = min(4, os.cpu_count() or 1)
+
+@st.cache_resource
+def get_result_executor():
+    return ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="result-precompute")
+
+# 事前計算の間に合い率（プロセス全体で集計）
+@st.cache_resource
+def get_precompute_stats():
+    return {"lock": threading.Lock(), "shown": 0, "ready": 0, "wait_ms": 0.0}
+
+# 結果表示ごとに事前計算が間に合ったか・待機時間を記録してログ出力
+def record_precompute_display(ready, wait_ms):
+    stats = get_precompute_stats()
+    with stats["lock"]:
+        stats["shown"] += 1
+        stats["ready"] += int(ready)
+        stats["wait_ms"] += wait_ms
+        shown, ready_count, total_wait = stats["shown"], stats["ready"], stats["wait_ms"]
+    logger.info(
+        "診断結果表示: %s 待機%.0fms（間に合い率 %d/%d、平均待機 %.0fms）",
+        "事前計算済み" if ready else "未完了", wait_ms, ready_count, shown, total_wait / shown
+    )
+
+# 事前計算を投入（stale はその計算が古くなったことをワーカーに伝えるフラグ）
+def submit_precompute(user_answers, score, bias_count, total):
+    stale = threading.Event()
+    future = get_result_executor().submit(
+        build_results, list(user_answers), score, dict(bias_count), total, stale
+    )
+    return future, stale
+
+# バイアス強度マップをPNG画像として描画（ワーカースレッドから呼ぶためpyplotは使わない）
+def create_bias_chart(detected_biases):
+    biases = list(detected_biases.keys())
+    counts = list(detected_biases.values())
+    
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    
+    # グラデーションバー作成
+    cmap = create_gradient_cmap()
+    bar_colors = cmap(np.linspace(0, 1, len(biases)))
+    
+    bars = ax.barh(
+        biases, 
+        counts, 
+        color=bar_colors, 
+        edgecolor='white', 
+        linewidth=2,
+        height=0.6
+    )
+    
+    # 3D効果追加
+    for bar in bars:
+        bar.set_hatch("///")
+        bar.set_alpha(0.9)
+    
+    # デザイン調整
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color(colors["text"])
+    ax.spines['bottom'].set_color(colors["text"])
+    
+    ax.set_xlabel('バイアス検出回数', fontsize=12, color=colors["text"])
+    ax.set_title('各バイアスの相対的強度', 
+                pad=20, fontsize=14, color=colors["text"], weight='bold')
+    
+    # バーラベル追加
+    for i, (b, c) in enumerate(zip(biases, counts)):
+        ax.text(
+            c + 0.1, 
+            i, 
+            f"{c}回",
+            va='center', 
+            color=colors["text"],
+            fontweight='bold'
+        )
+    
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+# 診断結果の組み立て（Streamlitの描画は行わず、表示に必要なデータだけを返す）
+def build_results(user_answers, score, bias_count, total, stale=None):
+    ratio = score / total
+    detected_biases = {k: v for k, v in bias_count.items() if v > 0}
+    
+    # 回答が変わって不要になった計算は、重いグラフ描画の前に打ち切る
+    if stale is not None and stale.is_set():
+        return None
+    incorrect_answers = [ans for ans in user_answers if ans['user_choice'] != ans['correct_choice']]
+    
+    return {
+        "score": score,
+        "total": total,
+        "ratio": ratio,
+        "detected_biases": detected_biases,
+        "chart": create_bias_chart(detected_biases) if detected_biases else None,
+        "tier": next(tier for tier in RESULT_TIERS if ratio >= tier[0]),
+        "correct_answers": [ans for ans in user_answers if ans['user_choice'] == ans['correct_choice']],
+        "incorrect_answers": incorrect_answers,
+        "bias_examples": {
+            bias: [ans for ans in incorrect_answers if ans['bias'] == bias]
+            for bias in detected_biases
+        },
+    }
+
 # サイドバー設定
 with st.sidebar:
     st.header("診断設定")
@@ -460,11 +799,48 @@ for i, q in enumerate(selected_questions):
             else:
                 st.warning(f"未定義のバイアスが検出されました: {q['bias']}")
 
+# 全問回答した時点で診断結果をバックグラウンドで事前計算（回答が変わったら破棄）
+answers_key = (category, tuple(st.session_state.get(f"q{i}") for i in range(len(selected_questions))))
+if st.session_state.get("precompute_key") != answers_key:
+    pending = st.session_state.get("precompute_job")
+    if pending is not None:
+        future, stale = pending
+        stale.set()
+        future.cancel()
+    st.session_state.precompute_key = answers_key
+    st.session_state.precompute_job = None
+    if len(user_answers) == len(selected_questions):
+        st.session_state.precompute_job = submit_precompute(
+            user_answers, score, bias_count, len(selected_questions)
+        )
+
 # 診断結果の表示
 if st.button("診断結果を表示", type="primary", use_container_width=True):
     if len(user_answers) < len(selected_questions):
         st.warning("⚠️ すべての質問に回答してから診断結果を表示してください。")
     else:
+        job = st.session_state.get("precompute_job")
+        future = job[0] if job is not None else None
+        
+        # 事前計算の間に合い率と待ち時間を計測
+        ready = future is not None and future.done()
+        wait_start = time.perf_counter()
+        if future is not None and (ready or not future.cancel()):
+            # 完了済み、または実行中の事前計算はそのまま利用
+            results = future.result()
+        else:
+            # 未着手の計算は他ユーザーの待ち行列に並ばせず、その場で計算
+            results = build_results(user_answers, score, bias_count, len(selected_questions))
+            st.session_state.precompute_job = None
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+        record_precompute_display(ready, wait_ms)
+        
+        # 検出バイアスを復習スケジュールに登録
+        review_schedule = get_review_schedule()
+        added = schedule_biases(review_schedule, results['detected_biases'], int(time.time()))
+        if added:
+            save_review_entries(added)
+        
         st.markdown("---")
         
         # ヘッダー
@@ -474,12 +850,12 @@ if st.button("診断結果を表示", type="primary", use_container_width=True):
         with col1:
             st.metric(
                 "正解数", 
-                f"{score}/{len(selected_questions)}",
+                f"{results['score']}/{results['total']}",
                 help="正解数が少ないほどバイアスの影響が強い"
             )
         
         with col2:
-            ratio = score/len(selected_questions)
+            ratio = results['ratio']
             st.metric(
                 "正解率", 
                 f"{int(ratio*100)}%",
@@ -491,104 +867,26 @@ if st.button("診断結果を表示", type="primary", use_container_width=True):
             st.caption("※正解率50%が基準値（高いほど合理的）")
         
         # バイアス分布の可視化（検出されたバイアスのみ表示）
-        detected_biases = {k: v for k, v in bias_count.items() if v > 0}
+        detected_biases = results['detected_biases']
         
         if detected_biases:
             st.markdown("### 📊 あなたのバイアス強度マップ")
-            biases = list(detected_biases.keys())
-            counts = list(detected_biases.values())
-            
-            fig, ax = plt.subplots(figsize=(12, 8))
-            
-            # グラデーションバー作成
-            cmap = create_gradient_cmap()
-            bar_colors = cmap(np.linspace(0, 1, len(biases)))
-            
-            bars = ax.barh(
-                biases, 
-                counts, 
-                color=bar_colors, 
-                edgecolor='white', 
-                linewidth=2,
-                height=0.6
-            )
-            
-            # 3D効果追加
-            for bar in bars:
-                bar.set_hatch("///")
-                bar.set_alpha(0.9)
-            
-            # デザイン調整
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color(colors["text"])
-            ax.spines['bottom'].set_color(colors["text"])
-            
-            ax.set_xlabel('バイアス検出回数', fontsize=12, color=colors["text"])
-            ax.set_title('各バイアスの相対的強度', 
-                        pad=20, fontsize=14, color=colors["text"], weight='bold')
-            
-            # バーラベル追加
-            for i, (b, c) in enumerate(zip(biases, counts)):
-                ax.text(
-                    c + 0.1, 
-                    i, 
-                    f"{c}回",
-                    va='center', 
-                    color=colors["text"],
-                    fontweight='bold'
-                )
-            
-            # 日本語フォント対応
-            plt.rcParams['font.family'] = ['DejaVu Sans', 'Hiragino Sans', 'Yu Gothic', 'Meiryo', 'Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic', 'Noto Sans CJK JP']
-            
-            st.pyplot(fig)
+            st.image(results['chart'], use_container_width=True)
         else:
             st.success("🎯 検出された強いバイアスはありませんでした！")
             st.balloons()
         
         # 総合評価
         st.markdown("### 📝 総合評価")
-        ratio = score / len(selected_questions)
-        
-        if ratio >= 0.8:
-            st.success(f"**🎖️ 優秀！ 深層心理バイアスに囚われない合理的思考ができています**")
-            st.write("""
-            - ✅ 感情より事実を重視する判断力
-            - ✅ マーケティング手法を見抜く洞察力  
-            - ✅ 統計的・論理的思考力
-            - ✅ 長期的視点での意思決定能力
-            """)
-        elif ratio >= 0.6:
-            st.info(f"**🧠 良好！ バイアスを意識しつつも、時々影響を受けています**")
-            st.write("""
-            - ⚠️ 特定の状況で感情的判断をしがち
-            - ⚠️ 『お得』という表現に弱い傾向
-            - ⚠️ 周囲の意見に影響されることがある
-            - ✅ 基本的な論理的思考は身についている
-            """)
-        elif ratio >= 0.4:
-            st.warning(f"**⚠️ 要注意！ 複数のバイアスの影響を受けています**")
-            st.write("""
-            - ❌ 広告文句や営業トークに弱い
-            - ❌ 過去の選択に固執しがち  
-            - ❌ 数字の表現方法に大きく影響される
-            - ❌ 短期的な利益を過大評価する傾向
-            """)
-        else:
-            st.error(f"**🚨 改善必要！ 強い心理的バイアスの影響下にあります**")
-            st.write("""
-            - 🔴 感情的な判断が論理的判断を上回っている
-            - 🔴 『みんながやっている』という同調圧力に弱い
-            - 🔴 数字よりも物語やイメージに強く影響される
-            - 🔴 長期的視点よりも目先の利益を重視
-            """)
+        _, level, headline, traits = results['tier']
+        getattr(st, level)(headline)
+        st.write(traits)
         
         # 個別問題の詳細解説
         st.markdown("### 🔍 あなたの回答分析")
         
-        correct_answers = [ans for ans in user_answers if ans['user_choice'] == ans['correct_choice']]
-        incorrect_answers = [ans for ans in user_answers if ans['user_choice'] != ans['correct_choice']]
+        correct_answers = results['correct_answers']
+        incorrect_answers = results['incorrect_answers']
         
         if correct_answers:
             with st.expander(f"✅ 正解した問題 ({len(correct_answers)}件)", expanded=False):
@@ -617,8 +915,7 @@ if st.button("診断結果を表示", type="primary", use_container_width=True):
                     
                     # 具体的事例
                     st.markdown("##### 🧪 あなたの具体例:")
-                    bias_examples = [ans for ans in user_answers if ans['bias'] == bias and ans['user_choice'] != ans['correct_choice']]
-                    for ans in bias_examples:
+                    for ans in results['bias_examples'][bias]:
                         st.write(f"- ✖️ {ans['question']}")
                         st.write(f"  → あなたの選択: `{ans['user_choice']}` (推奨: `{ans['correct_choice']}`)")
                         st.write(f"  💡 **なぜこうなったか**: {ans['explanation']}")
@@ -631,26 +928,8 @@ if st.button("診断結果を表示", type="primary", use_container_width=True):
                     
                     # 日常での実践方法
                     st.markdown("##### 📅 今日から始められる実践法:")
-                    practice_tips = {
-                        "損失回避": ["投資前に最大損失額を決める", "月1回ポートフォリオを見直す", "損失を『授業料』として記録する"],
-                        "サンクコスト": ["意思決定時に『これまでのコスト』を考慮しない練習", "定期的なサブスクリプション見直し日を設定", "『やめる勇気』を評価する"],
-                        "アンカリング": ["複数の情報源から価格を調べる習慣", "最初の価格を無視する練習", "相場観を養うため定期的に市場調査"],
-                        "現在バイアス": ["未来の自分への手紙を書く", "長期目標を毎日見る場所に掲示", "衝動的な決断は24時間待つルール"],
-                        "社会的証明": ["自分だけの判断基準リストを作る", "『みんな』の具体的な人数を確認する癖", "少数派の意見を意識的に探す"],
-                        "確証バイアス": ["自分の意見に反対する記事を必ず1つ読む", "友人に『反対意見』を求める", "決断前に反対理由を3つ挙げる"],
-                        "フレーミング効果": ["数値は必ず絶対値で確認", "複数の表現で同じ情報を見る", "％と実数の両方で確認する習慣"],
-                        "希少性の原理": ["『限定』『残りわずか』を見たら一度立ち止まる", "人工的希少性を見抜く練習", "本当の需要と供給を調べる"],
-                        "返報性の原理": ["贈り物の意図を考える習慣", "すぐにお返しせず時間を置く", "心理的な負債を作らないよう意識"],
-                        "同調圧力": ["『みんな』の正体を具体的に確認", "匿名で自分の意見を整理する時間を作る", "少数派でいることに慣れる"],
-                        "楽観バイアス": ["統計データと自分の予測を比較記録", "最悪シナリオを必ず想定", "第三者の意見を積極的に求める"],
-                        "後知恵バイアス": ["予測を事前に記録する習慣", "結果を知る前の自分の考えを思い出す", "不確実性を受け入れる練習"],
-                        "代表性ヒューリスティック": ["統計的基準率を調べる癖", "固定観念リストを作り定期見直し", "個別事例の特殊性を意識"],
-                        "可用性ヒューリスティック": ["印象的な事例と統計データを区別", "メディアの偏りを意識する", "身近な体験と全体傾向を分けて考える"],
-                        "プロスペクト理論": ["期待値計算を習慣化", "確実性と不確実性のリスクを比較", "確率的思考の訓練"]
-                    }
-                    
-                    if bias in practice_tips:
-                        for tip in practice_tips[bias]:
+                    if bias in PRACTICE_TIPS:
+                        for tip in PRACTICE_TIPS[bias]:
                             st.write(f"📌 {tip}")
 
         # 継続的改善のためのアドバイス
@@ -678,4 +957,53 @@ if st.button("診断結果を表示", type="primary", use_container_width=True):
         
         st.markdown("---")
         st.info("💡 **重要**: バイアスは完全に無くすものではありません。適切に認識し、重要な場面でコントロールすることが目標です。")
-        st.caption("※本診断は継続的な自己認識向上を目的としています。定期的な受診で成長を実感してください。")
\ No newline at end of file
+        st.caption("※本診断は継続的な自己認識向上を目的としています。定期的な受診で成長を実感してください。")
+
+# 復習モード（検出バイアスに関連する問題を間隔反復で再出題）
+review_schedule = get_review_schedule()
+if review_schedule["heap"]:
+    st.markdown("---")
+    st.markdown("### 🔁 復習モード")
+    st.caption("検出されたバイアスに関連する問題を、間隔をあけて繰り返し出題します")
+    st.caption("📌 このページのURLをブックマークしておくと、次回アクセス時も復習スケジュールを引き継げます")
+    
+    feedback = st.session_state.pop("review_feedback", None)
+    if feedback:
+        correct, message = feedback
+        (st.success if correct else st.error)(message)
+    
+    now = int(time.time())
+    review_qid = next_due_review(review_schedule, now)
+    if review_qid is None:
+        wait = review_schedule["heap"][0][0] - now
+        st.info(f"⏳ 次の復習は約{format_interval(wait)}後です。")
+        st.button("🔄 復習を確認", use_container_width=True)
+    else:
+        q = QUESTION_BANK[review_qid]
+        stage = review_schedule["stage"][review_qid]
+        with st.form("review_form", clear_on_submit=True):
+            st.caption(f"{BIAS_CATEGORIES[q['bias']]['icon']} {q['bias']}（復習段階 {stage + 1}/{len(REVIEW_INTERVALS)}）")
+            st.markdown(f"#### {q['question']}")
+            review_answer = st.radio(
+                "選択肢：",
+                q['options'],
+                key="review_answer",
+                index=None
+            )
+            submitted = st.form_submit_button("回答する", use_container_width=True)
+        
+        if submitted:
+            if review_answer is None:
+                st.warning("⚠️ 選択肢を選んでから回答してください。")
+            else:
+                correct = review_answer == q['correct']
+                answered_at = int(time.time())
+                interval = record_review(review_schedule, review_qid, correct, answered_at)
+                if interval is not None:
+                    save_review_entries([(answered_at + interval, review_qid, review_schedule["stage"][review_qid])])
+                    if correct:
+                        message = f"✅ 正解！ 次回は{format_interval(interval)}後に出題します。"
+                    else:
+                        message = f"❌ 推奨回答は `{q['correct']}` です。{q['explanation']}（{format_interval(interval)}後に再出題）"
+                    st.session_state.review_feedback = (correct, message)
+                st.rerun()